@@ -0,0 +1,542 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MODULE = 'github_trending'
+TRENDING_PAGE_SIZE = 25
+# 回放时各趋势页默认使用的编程语言，与 github_trending 的默认抓取矩阵一致
+DEFAULT_LANGUAGES = 'any/javascript/typescript/java/go/python'
+FETCH_MODES = ('threaded', 'async', 'graphql', 'pipeline')
+WORDS = ('fast', 'async', 'model', 'agent', 'parser', 'server', 'client', 'graph', 'cache', 'stream',
+         'vector', 'index', 'query', 'plugin', 'runtime', 'compiler', 'editor', 'terminal', 'kernel', 'shader')
+
+
+def fixture_key(repo_name):
+    return repo_name.replace('/', '__')
+
+
+class Fixtures:
+    """回放数据：优先使用录制的文件，缺失时按仓库名生成确定性的合成数据"""
+
+    def __init__(self, directory=None, repos=150, readme_bytes=6000):
+        self.directory = directory
+        self.readme_bytes = readme_bytes
+        self.repo_names = [f'owner{idx}/repo{idx}' for idx in range(repos)]
+
+    def _load(self, *parts):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def trending_html(self, language, since):
+        captured = self._load('trending', f'{language}-{since}.html')
+        if captured is not None:
+            return captured
+        # 不同语言、时间范围的榜单取仓库列表中不同的（部分重叠的）一段
+        offset = int(hashlib.md5(f'{language}/{since}'.encode()).hexdigest(), 16) % len(self.repo_names)
+        articles = []
+        for rank in range(TRENDING_PAGE_SIZE):
+            name = self.repo_names[(offset + rank * 3) % len(self.repo_names)]
+            seed = random.Random(name)
+            articles.append(f"""
+<article class="Box-row">
+  <h2 class="h3 lh-condensed"><a href="/{name}">{name}</a></h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">{' '.join(seed.choices(WORDS, k=8))}</p>
+  <span itemprop="programmingLanguage">{language if language != 'any' else 'Python'}</span>
+  <a class="Link Link--muted d-inline-block mr-3" href="/{name}/stargazers">{seed.randint(100, 90000):,}</a>
+  <a class="Link Link--muted d-inline-block mr-3" href="/{name}/forks">{seed.randint(10, 9000):,}</a>
+  <span class="d-inline-block float-sm-right">{seed.randint(10, 3000):,} stars today</span>
+</article>""")
+        return f'<html><body><main>{"".join(articles)}</main></body></html>'
+
+    def repo(self, repo_name):
+        captured = self._load('repos', fixture_key(repo_name) + '.json')
+        if captured is not None:
+            return json.loads(captured)
+        seed = random.Random(repo_name)
+        created = datetime(2015, 1, 1, tzinfo=timezone.utc) + timedelta(days=seed.randint(0, 3000))
+        return {
+            'full_name': repo_name,
+            'description': ' '.join(seed.choices(WORDS, k=12)),
+            'homepage': f'https://{repo_name.split("/")[1]}.example.com',
+            'forks_count': seed.randint(10, 9000),
+            'stargazers_count': seed.randint(100, 90000),
+            'license': {'name': seed.choice(['MIT License', 'Apache License 2.0', 'GNU GPL v3'])},
+            'pushed_at': (created + timedelta(days=seed.randint(1, 300))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'created_at': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+
+    def readme(self, repo_name):
+        captured = self._load('readme', fixture_key(repo_name) + '.md')
+        if captured is not None:
+            return captured
+        seed = random.Random('readme:' + repo_name)
+        words = []
+        size = 0
+        while size < self.readme_bytes:
+            word = seed.choice(WORDS) + str(seed.randint(0, 999))
+            words.append(word)
+            size += len(word) + 1
+        return f'# {repo_name}\n\n' + ' '.join(words)
+
+
+class ReplayConfig:
+    """假服务器的行为：延迟、速率限制与错误注入"""
+
+    def __init__(self, github_latency=0.0, llm_latency=0.0, rate_limit=0, secondary_every=0, error_rate=0.0,
+                 seed=0):
+        self.github_latency = github_latency
+        self.llm_latency = llm_latency
+        self.rate_limit = rate_limit  # 每个 token 的主额度，0 为不限
+        self.secondary_every = secondary_every  # 每 N 个请求返回一次次级限额 403，0 为关闭
+        self.error_rate = error_rate  # 返回 502 的比例
+        self.random = random.Random(seed)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixtures, config):
+        super().__init__(('127.0.0.1', 0), ReplayHandler)
+        self.fixtures = fixtures
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.statuses = {}
+        self.used = {}
+        self.total = 0
+        self.reset_at = int(time.time()) + 3600
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def count(self, route, status):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, route, status, body, content_type='application/json', headers=None):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.server.count(route, status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def github_limits(self, route):
+        """按 token 扣减额度并注入错误，需要拦截时返回 True"""
+        config = self.server.config
+        if config.github_latency:
+            time.sleep(config.github_latency)
+        token = self.headers.get('Authorization', '')
+        with self.server.lock:
+            self.server.total += 1
+            total = self.server.total
+            used = self.server.used[token] = self.server.used.get(token, 0) + 1
+            failure = config.random.random() < config.error_rate
+        limit = config.rate_limit or 1000000
+        self.rate_headers = {
+            'X-RateLimit-Limit': limit,
+            'X-RateLimit-Remaining': max(limit - used, 0),
+            'X-RateLimit-Reset': self.server.reset_at,
+        }
+        if config.rate_limit and used > config.rate_limit:
+            self.send_body(route, 403, '{"message": "API rate limit exceeded"}', headers=self.rate_headers)
+            return True
+        if config.secondary_every and total % config.secondary_every == 0:
+            self.send_body(route, 403, '{"message": "You have exceeded a secondary rate limit"}',
+                           headers=dict(self.rate_headers, **{'Retry-After': 1}))
+            return True
+        if failure:
+            self.send_body(route, 502, '{"message": "Server Error"}')
+            return True
+        return False
+
+    def send_conditional(self, route, body, content_type='application/json'):
+        """带 ETag 的响应，If-None-Match 命中时返回 304"""
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+        headers = dict(self.rate_headers, ETag=etag)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_body(route, 304, b'', headers=headers)
+        else:
+            self.send_body(route, 200, body, content_type, headers)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        fixtures = self.server.fixtures
+        if parts[:1] == ['trending']:
+            query = parse_qs(url.query)
+            language = parts[1] if len(parts) > 1 else 'any'
+            since = query.get('since', ['daily'])[0]
+            self.send_body('trending', 200, fixtures.trending_html(language, since), 'text/html; charset=utf-8')
+            return
+        if parts == ['rate_limit']:
+            remaining = self.server.config.rate_limit or 1000000
+            self.send_body('rate_limit', 200, json.dumps({'resources': {
+                'core': {'remaining': remaining, 'reset': self.server.reset_at},
+                'graphql': {'remaining': remaining, 'reset': self.server.reset_at},
+            }}))
+            return
+        if parts[:1] == ['repos'] and len(parts) in (3, 4):
+            repo_name = f'{parts[1]}/{parts[2]}'
+            route = 'readme' if len(parts) == 4 else 'repo'
+            if self.github_limits(route):
+                return
+            if repo_name not in fixtures.repo_names:
+                self.send_body(route, 404, '{"message": "Not Found"}', headers=self.rate_headers)
+            elif route == 'readme':
+                self.send_conditional(route, fixtures.readme(repo_name), 'text/plain; charset=utf-8')
+            else:
+                self.send_conditional(route, json.dumps(fixtures.repo(repo_name)))
+            return
+        self.send_body('unknown', 404, '{"message": "Not Found"}')
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if self.path.endswith('/chat/completions'):
+            if self.server.config.llm_latency:
+                time.sleep(self.server.config.llm_latency)
+            prompt = body['messages'][-1]['content']
+            summary = '回放摘要：' + hashlib.md5(prompt.encode('utf-8')).hexdigest()
+            self.send_body('chat', 200, json.dumps({
+                'choices': [{'message': {'content': summary}}],
+                'usage': {'total_tokens': len(prompt) // 4 + 100},
+            }))
+            return
+        if self.path.endswith('/graphql'):
+            if self.github_limits('graphql'):
+                return
+            variables = body.get('variables', {})
+            data = {'rateLimit': {'cost': 1, 'remaining': 5000, 'resetAt': None}}
+            errors = []
+            for key, owner in variables.items():
+                if not key.startswith('o'):
+                    continue
+                idx = key[1:]
+                repo_name = f"{owner}/{variables['n' + idx]}"
+                if repo_name not in self.server.fixtures.repo_names:
+                    data[f'r{idx}'] = None
+                    errors.append({'type': 'NOT_FOUND', 'path': [f'r{idx}']})
+                    continue
+                repo = self.server.fixtures.repo(repo_name)
+                data[f'r{idx}'] = {
+                    'forkCount': repo['forks_count'],
+                    'stargazerCount': repo['stargazers_count'],
+                    'licenseInfo': repo['license'],
+                    'pushedAt': repo['pushed_at'],
+                    'createdAt': repo['created_at'],
+                    'description': repo['description'],
+                    'homepageUrl': repo['homepage'],
+                    'readme_md': {'text': self.server.fixtures.readme(repo_name)},
+                }
+            result = {'data': data}
+            if errors:
+                result['errors'] = errors
+            self.send_body('graphql', 200, json.dumps(result), headers=self.rate_headers)
+            return
+        self.send_body('unknown', 404, '{"message": "Not Found"}')
+
+
+def record(directory, languages, date_ranges):
+    """录制真实的趋势页、仓库信息与 README，供之后离线回放；需要 GITHUB_TOKEN"""
+    import requests
+    from trending_parser import parse_trending_html
+    token = os.environ['GITHUB_TOKEN']
+    headers = {'Authorization': f'token {token}', 'Accept': 'application/vnd.github.v3+json'}
+    for name in ('trending', 'repos', 'readme'):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+    repo_names = set()
+    with requests.Session() as session:
+        for language in languages:
+            for since in date_ranges:
+                url = 'https://github.com/trending' + (f'/{language}' if language != 'any' else '')
+                response = session.get(url, params={'since': since} if since != 'daily' else None, timeout=30)
+                response.raise_for_status()
+                with open(os.path.join(directory, 'trending', f'{language}-{since}.html'), 'w', encoding='utf-8') as f:
+                    f.write(response.text)
+                repo_names.update(repo['repository_name'] for repo in parse_trending_html(response.text))
+                time.sleep(2)
+        for repo_name in sorted(repo_names):
+            response = session.get(f'https://api.github.com/repos/{repo_name}', headers=headers, timeout=30)
+            if response.status_code != 200:
+                continue
+            with open(os.path.join(directory, 'repos', fixture_key(repo_name) + '.json'), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            response = session.get(f'https://api.github.com/repos/{repo_name}/readme', timeout=30,
+                                   headers=dict(headers, Accept='application/vnd.github.raw'))
+            if response.status_code == 200:
+                with open(os.path.join(directory, 'readme', fixture_key(repo_name) + '.md'), 'w', encoding='utf-8') as f:
+                    f.write(response.text)
+    print(f'recorded {len(repo_names)} repos to {directory}')
+
+
+def recorded_repo_names(directory):
+    """录制目录中的仓库名"""
+    path = os.path.join(directory, 'repos')
+    return sorted(name[:-len('.json')].replace('__', '/', 1) for name in os.listdir(path) if name.endswith('.json'))
+
+
+def run_tracker(args, fetch_mode, env, metrics_path):
+    """以子进程运行一次完整的 main()，返回 (墙钟秒数, 峰值 RSS MiB)"""
+    command = [sys.executable, f'{MODULE}.py', '--fetch-mode', fetch_mode, '--metrics-json', metrics_path]
+    start_time = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdout=None if args.verbose else subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start_time
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise SystemExit(f'{MODULE}.py exited with {process.returncode}')
+    # ru_maxrss 在 Linux 上是 KiB，macOS 上是字节
+    peak = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return wall_time, peak
+
+
+def summarize_round(name, wall_time, peak, server, metrics_path):
+    """汇总一轮运行的数字"""
+    with open(metrics_path, encoding='utf-8') as f:
+        report = json.load(f)
+    histograms = report['histograms']
+    counters = report['counters']
+    with server.lock:
+        requests_by_route = dict(server.requests)
+        statuses = dict(server.statuses)
+        server.requests.clear()
+        server.statuses.clear()
+    stages = {item['labels']['stage']: round(item['sum'], 3)
+              for item in histograms if item['name'] == 'stage_seconds'}
+    # 详情阶段的吞吐：写入（保存 / 未变化 / 已删除）的仓库数除以 refresh 阶段耗时
+    repos_refreshed = sum(item['value'] for item in counters if item['name'] == 'repos_refreshed_total')
+    return {
+        'round': name,
+        'wall_seconds': round(wall_time, 3),
+        'peak_rss_mb': round(peak, 1),
+        'requests': sum(requests_by_route.values()),
+        'requests_by_route': requests_by_route,
+        'statuses': statuses,
+        'db_statements': sum(item['count'] for item in histograms if item['name'] == 'db_statement_seconds'),
+        'db_seconds': round(sum(item['sum'] for item in histograms if item['name'] == 'db_statement_seconds'), 3),
+        'llm_requests': sum(item['count'] for item in histograms if item['name'] == 'llm_request_seconds'),
+        'retries': sum(item['value'] for item in counters if item['name'].endswith('retries_total')),
+        'repos_refreshed': repos_refreshed,
+        'repos_per_second': round(repos_refreshed / stages['refresh'], 2) if stages.get('refresh') else 0,
+        'stages': stages,
+    }
+
+
+# 与基线对比时检查的数字，越小越好
+COMPARED = ('wall_seconds', 'peak_rss_mb', 'requests', 'db_statements', 'llm_requests')
+
+
+def compare(results, baseline, tolerance):
+    """逐轮与基线对比，返回超出容差的项"""
+    regressions = []
+    previous = {item['round']: item for item in baseline['rounds']}
+    for item in results['rounds']:
+        base = previous.get(item['round'])
+        if not base:
+            continue
+        for key in COMPARED:
+            if not base.get(key):
+                continue
+            change = (item[key] - base[key]) / base[key]
+            marker = ''
+            if change > tolerance:
+                marker = '  <-- regression'
+                regressions.append(f"{item['round']}.{key}")
+            print(f"  {item['round']:<6} {key:<14} {base[key]:>10} -> {item[key]:>10} ({change:+.1%}){marker}")
+    return regressions
+
+
+def reset_database(database_url):
+    """删除基准库中的全部表，下一次运行由迁移重新建表，保证每种获取方式都从冷启动开始"""
+    import mysql.connector
+    url = urlparse(database_url)
+    conn = mysql.connector.connect(host=url.hostname, port=url.port or 3306, user=url.username,
+                                   password=url.password, database=url.path.lstrip('/'))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SHOW TABLES")
+        tables = [name for (name,) in cursor.fetchall()]
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for name in tables:
+            cursor.execute(f"DROP TABLE `{name}`")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def run_mode(args, fetch_mode, env, server, metrics_path):
+    """用一种获取方式运行 args.rounds 轮，返回各轮数字"""
+    rounds = []
+    # 第一轮为冷启动（全部仓库需要刷新与生成摘要），之后各轮主要命中条件请求与调度跳过
+    for idx in range(args.rounds):
+        name = 'cold' if idx == 0 else f'warm{idx}'
+        wall_time, peak = run_tracker(args, fetch_mode, env, metrics_path)
+        rounds.append(summarize_round(name, wall_time, peak, server, metrics_path))
+        item = rounds[-1]
+        print(f"{fetch_mode:<9} {name:<6} wall={item['wall_seconds']:.2f}s "
+              f"repos/s={item['repos_per_second']:.1f} requests={item['requests']} "
+              f"db_statements={item['db_statements']} db={item['db_seconds']:.2f}s llm={item['llm_requests']} "
+              f"retries={item['retries']} peak_rss={item['peak_rss_mb']:.1f}MiB stages={item['stages']}")
+    return rounds
+
+
+def benchmark(args):
+    database_url = os.environ.get('BENCHMARK_DATABASE_URL')
+    if not database_url:
+        # 基准会写入并覆盖数据，必须显式指定一个专用的库
+        raise SystemExit('请设置 BENCHMARK_DATABASE_URL 指向一个可丢弃的 MySQL 库')
+    fetch_modes = args.fetch_mode.split(',')
+    unknown = [mode for mode in fetch_modes if mode not in FETCH_MODES]
+    if unknown:
+        raise SystemExit(f"unknown fetch mode: {', '.join(unknown)} (choose from {', '.join(FETCH_MODES)})")
+    fixtures = Fixtures(args.fixtures, args.repos, args.readme_bytes)
+    if args.fixtures:
+        fixtures.repo_names = recorded_repo_names(args.fixtures)
+    config = ReplayConfig(args.github_latency / 1000, args.llm_latency / 1000, args.rate_limit,
+                          args.secondary_every, args.error_rate)
+    server = ReplayServer(fixtures, config).start()
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        GITHUB_API_URL=server.url,
+        GITHUB_TRENDING_URL=f'{server.url}/trending',
+        GITHUB_GRAPHQL_URL=f'{server.url}/graphql',
+        GITHUB_TOKENS=','.join(f'replay-token-{idx}' for idx in range(args.tokens)),
+        OPENAI_API_URL=server.url,
+        OPENAI_API_KEY='replay',
+        OPENAI_MODEL='replay',
+        TRENDING_LANGUAGES=args.languages,
+        TRENDING_MIN_INTERVAL='0',
+        GITHUB_REQUEST_INTERVAL='0',
+        GITHUB_RATE_LIMIT=str(args.github_rate),
+    )
+    env.pop('METRICS_JSON', None)
+    env.pop('METRICS_PROM', None)
+
+    metrics_path = os.path.abspath(os.path.join(args.workdir, 'replay_metrics.json'))
+    os.makedirs(args.workdir, exist_ok=True)
+    runs = []
+    for fetch_mode in fetch_modes:
+        if len(fetch_modes) > 1:
+            # 对比多种获取方式时，每种方式都从空库开始，否则后面的方式第一轮就是热启动
+            reset_database(database_url)
+        rounds = run_mode(args, fetch_mode, env, server, metrics_path)
+        runs.append({'fetch_mode': fetch_mode, 'repos': len(fixtures.repo_names), 'rounds': rounds})
+    server.shutdown()
+    if len(runs) > 1:
+        print('repos/s by round: ' + '  '.join(
+            f"{run['fetch_mode']}=" + '/'.join(f"{item['repos_per_second']:.1f}" for item in run['rounds'])
+            for run in runs))
+
+    # 单一方式时保持原有的结果格式，多种方式时按方式列出
+    results = runs[0] if len(runs) == 1 else {'repos': len(fixtures.repo_names), 'modes': runs}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        baseline_runs = {run['fetch_mode']: run for run in baseline.get('modes', [baseline])}
+        regressions = []
+        for run in runs:
+            if run['fetch_mode'] in baseline_runs:
+                print(f"{run['fetch_mode']}:")
+                regressions += [f"{run['fetch_mode']}.{name}"
+                                for name in compare(run, baseline_runs[run['fetch_mode']], args.tolerance)]
+        if regressions:
+            raise SystemExit(f"regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+
+def serve(args):
+    """只启动假服务器，便于手工运行 github_trending.py 或调试"""
+    fixtures = Fixtures(args.fixtures, args.repos, args.readme_bytes)
+    if args.fixtures:
+        fixtures.repo_names = recorded_repo_names(args.fixtures)
+    config = ReplayConfig(args.github_latency / 1000, args.llm_latency / 1000, args.rate_limit,
+                          args.secondary_every, args.error_rate)
+    server = ReplayServer(fixtures, config)
+    print(f'GITHUB_API_URL={server.url} GITHUB_TRENDING_URL={server.url}/trending OPENAI_API_URL={server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='github_trending 离线回放与端到端基准')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    recorder = subparsers.add_parser('record', help='录制真实数据到目录')
+    recorder.add_argument('directory')
+    recorder.add_argument('--languages', default=DEFAULT_LANGUAGES)
+    recorder.add_argument('--date-ranges', default='daily')
+
+    for name, help_text in (('run', '启动假服务器并端到端运行 main()，输出各轮数字'),
+                            ('serve', '只启动假服务器')):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--fixtures', help='录制目录；不指定时使用合成数据')
+        command.add_argument('--repos', type=int, default=150, help='合成数据的仓库数')
+        command.add_argument('--readme-bytes', type=int, default=6000, help='合成 README 的大小')
+        command.add_argument('--github-latency', type=float, default=20, help='GitHub 请求延迟（毫秒）')
+        command.add_argument('--llm-latency', type=float, default=200, help='摘要请求延迟（毫秒）')
+        command.add_argument('--rate-limit', type=int, default=0, help='每个 token 的主额度，0 为不限')
+        command.add_argument('--secondary-every', type=int, default=0, help='每 N 个请求注入一次次级限额 403')
+        command.add_argument('--error-rate', type=float, default=0, help='注入 502 的比例')
+    runner = subparsers.choices['run']
+    runner.add_argument('--fetch-mode', default='pipeline',
+                        help=f"获取方式（{' / '.join(FETCH_MODES)}），逗号分隔多个时依次从空库运行并对比 repos/s")
+    runner.add_argument('--languages', default=DEFAULT_LANGUAGES)
+    runner.add_argument('--tokens', type=int, default=1, help='模拟的 GitHub token 数')
+    runner.add_argument('--github-rate', type=float, default=50, help='每个 token 每秒请求数上限')
+    runner.add_argument('--rounds', type=int, default=2, help='运行轮数，第一轮为冷启动')
+    runner.add_argument('--workdir', default='.benchmark')
+    runner.add_argument('--output', help='把结果写入 JSON 文件')
+    runner.add_argument('--baseline', help='与之前保存的结果对比')
+    runner.add_argument('--tolerance', type=float, default=0.1, help='允许的退化比例')
+    runner.add_argument('--verbose', action='store_true', help='显示 github_trending.py 的输出')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'record':
+        record(args.directory, args.languages.split('/'), args.date_ranges.split('/'))
+    elif args.command == 'serve':
+        serve(args)
+    else:
+        benchmark(args)
+
+
+if __name__ == '__main__':
+    main()
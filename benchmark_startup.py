@@ -0,0 +1,64 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 导入 github_trending 的时间预算（毫秒），超出时以非零状态退出
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', '400'))
+ROUNDS = int(os.environ.get('STARTUP_ROUNDS', '5'))
+MODULE = 'github_trending'
+
+
+def clean_env():
+    """去掉数据库与密钥配置，确认导入阶段不依赖它们"""
+    env = dict(os.environ)
+    for name in ('DATABASE_URL', 'GITHUB_TOKEN', 'OPENAI_API_KEY', 'OPENAI_API_URL', 'OPENAI_MODEL'):
+        env.pop(name, None)
+    return env
+
+
+def measure_import():
+    """用 python -X importtime 测量一次导入，返回 (总耗时毫秒, {模块: 累计耗时毫秒})"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {MODULE}'],
+                            capture_output=True, text=True, env=clean_env(), check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # 格式：import time: self [us] | cumulative | imported package
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(cumulative_us) / 1000
+    return cumulative[MODULE], cumulative
+
+
+def measure_help():
+    """测量 `github_trending.py --help` 的墙钟时间（毫秒）"""
+    start_time = time.perf_counter()
+    subprocess.run([sys.executable, f'{MODULE}.py', '--help'], capture_output=True, env=clean_env(), check=True)
+    return (time.perf_counter() - start_time) * 1000
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    totals = []
+    cumulative = {}
+    for _ in range(ROUNDS):
+        total, cumulative = measure_import()
+        totals.append(total)
+    help_times = [measure_help() for _ in range(ROUNDS)]
+
+    median = statistics.median(totals)
+    print(f'import {MODULE}: median {median:.1f} ms  (min {min(totals):.1f}, max {max(totals):.1f}, '
+          f'budget {IMPORT_TIME_BUDGET_MS:.0f})')
+    print(f'{MODULE}.py --help: median {statistics.median(help_times):.1f} ms')
+    # 顶层依赖（不含子模块）按累计耗时排序
+    top_level = {name: ms for name, ms in cumulative.items() if '.' not in name and name != MODULE}
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:10]:
+        print(f'  {name:<24} {ms:8.1f} ms')
+    if median > IMPORT_TIME_BUDGET_MS:
+        sys.exit(f'import time {median:.1f} ms exceeds budget {IMPORT_TIME_BUDGET_MS:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+# 对比趋势统计的两种写法：逐行 upsert（每行一次提交）与整批多行 upsert（一次提交）。
+# 会写入并删除 github_repository 中以 PREFIX 开头的仓库，必须使用专用的库
+PREFIX = 'benchmark-upsert/'
+
+ROW_UPSERT = """
+INSERT INTO github_repository
+(name, language, star_num, fork_num, first_in_trending, last_in_trending, top_in_trending, in_trending_time)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+star_num = VALUES(star_num),
+fork_num = VALUES(fork_num),
+last_in_trending = VALUES(last_in_trending),
+in_trending_time = IF(last_in_trending = VALUES(last_in_trending), in_trending_time, in_trending_time + 1),
+top_in_trending = LEAST(top_in_trending, VALUES(top_in_trending))
+"""
+
+
+def make_pages(pages, rows, seed):
+    """合成一轮趋势页：any 页与各语言页之间有重复仓库，与真实榜单相同"""
+    rng = random.Random(seed)
+    pool = [f'{PREFIX}repo{idx}' for idx in range(pages * rows)]
+    result = []
+    for page in range(pages):
+        names = rng.sample(pool, rows)
+        result.append([{
+            'repository_name': name,
+            'language': 'Python',
+            'star_num': rng.randint(100, 100000),
+            'fork_num': rng.randint(0, 10000),
+            'sort_index': idx,
+        } for idx, name in enumerate(names, 1)])
+    return result
+
+
+def per_row(gt, pages):
+    """基线写法：每个仓库一条语句、一次提交"""
+    today = datetime.now(timezone.utc).date()
+    statements = 0
+    for repos in pages:
+        for repo in repos:
+            gt.execute_query(ROW_UPSERT, (repo['repository_name'], repo['language'], repo['star_num'],
+                                          repo['fork_num'], today, today, repo['sort_index'], 1))
+            statements += 1
+    return statements
+
+
+def bulk(gt, pages):
+    """当前写法：update_trending_stats（跨页去重后一条多行 upsert、一次提交）"""
+    gt.trending_stats_written.clear()
+    repos = [repo for page in pages for repo in page]
+    gt.update_trending_stats(repos)
+    return 1
+
+
+SHAPES = {'per_row': per_row, 'bulk': bulk}
+
+
+def cleanup(gt):
+    gt.execute_query("DELETE FROM github_repository WHERE name LIKE %s", (PREFIX + '%',))
+
+
+def measure(gt, shape, pages, rounds):
+    """每轮先清空基准数据：第一遍全部为插入，第二遍同一批数据全部走 ON DUPLICATE KEY UPDATE"""
+    inserts, updates = [], []
+    statements = 0
+    for _ in range(rounds):
+        cleanup(gt)
+        for timings in (inserts, updates):
+            start_time = time.perf_counter()
+            statements = SHAPES[shape](gt, pages)
+            timings.append((time.perf_counter() - start_time) * 1000)
+    cleanup(gt)
+    return {
+        'statements': statements,
+        'insert_ms': round(statistics.median(inserts), 2),
+        'update_ms': round(statistics.median(updates), 2),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='趋势统计 upsert 写法对比（逐行 vs 多行）')
+    parser.add_argument('--pages', type=int, default=6, help='每轮的趋势页数')
+    parser.add_argument('--rows', type=int, default=25, help='每页仓库数')
+    parser.add_argument('--rounds', type=int, default=5, help='重复次数，取中位数')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='把结果写入 JSON 文件')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    database_url = os.environ.get('BENCHMARK_DATABASE_URL')
+    if not database_url:
+        raise SystemExit('请设置 BENCHMARK_DATABASE_URL 指向一个可丢弃的 MySQL 库')
+    # github_trending 在导入时读取 DATABASE_URL
+    os.environ['DATABASE_URL'] = database_url
+    import github_trending as gt
+
+    pages = make_pages(args.pages, args.rows, args.seed)
+    rows = sum(len(page) for page in pages)
+    unique = len({repo['repository_name'] for page in pages for repo in page})
+    results = {'rows': rows, 'unique_repos': unique}
+    try:
+        for shape in SHAPES:
+            results[shape] = measure(gt, shape, pages, args.rounds)
+            item = results[shape]
+            print(f"{shape:<8} rows={rows} unique={unique} statements={item['statements']} "
+                  f"insert={item['insert_ms']:.1f}ms update={item['update_ms']:.1f}ms")
+    finally:
+        gt.app.close()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,16 @@ import time
 import os
 from datetime import datetime, timedelta
 import pandas as pd
-from sqlalchemy import create_engine, types
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect, text, types
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 import pymysql
 
 # 从环境变量或使用默认值获取配置
 tocken = os.environ.get("STEAM_KEY")  # 你的steam_tocken
 steamid = os.environ.get("STEAM_ID")  # 你的steam_id
 database_url = os.environ['DATABASE_URL']
+# incremental：按 appid 与 rtime_last_played 比对后只 upsert 变化的游戏；replace：整表重写（旧行为）
+ingest_mode = os.environ.get("STEAM_INGEST_MODE", "incremental")
 
 import requests
 import json
@@ -45,36 +48,93 @@ def Steam_GetRecentlyPlayedGames(tocken, steamid):
     return res
 
 
+OWNED_GAME_COLUMNS = ["appid", "game_name", "img_icon_url", "playtime_forever", "playtime_windows_forever",
+                      "playtime_mac_forever", "playtime_linux_forever", "rtime_last_played"]
+
+metadata = MetaData()
+dim_steam_owned_game = Table(
+    "dim_steam_owned_game", metadata,
+    Column("appid", String(100), primary_key=True),
+    Column("game_name", String(255)),
+    Column("img_icon_url", String(255)),
+    Column("playtime_forever", Integer),
+    Column("playtime_windows_forever", Integer),
+    Column("playtime_mac_forever", Integer),
+    Column("playtime_linux_forever", Integer),
+    Column("rtime_last_played", Integer),
+)
+
+_engine = None
+
+
+def get_engine():
+    # 同一进程内复用一个 engine（连接池）
+    global _engine
+    if _engine is None:
+        _engine = create_engine(database_url + '?charset=utf8')
+    return _engine
+
+
+def SteamDA_OwnedGamesFrame(results):
+    # 直接由 JSON 构造 DataFrame，缺失字段补空
+    games = results.get("response", {}).get("games")
+    if not games:
+        # 私密资料或接口异常时没有 games，按空库处理会删掉整张表，直接中止本次运行
+        raise RuntimeError("Steam GetOwnedGames 未返回 games: %s" % json.dumps(results)[:200])
+    df = pd.json_normalize(games)
+    df = df.rename(columns={"name": "game_name"}).reindex(columns=OWNED_GAME_COLUMNS)
+    df["appid"] = df["appid"].astype(str)
+    return df
+
+
+def SteamDA_ChangedGames(df, stored):
+    # 新增的游戏，或 rtime_last_played 变化（玩过）的游戏
+    merged = df.merge(stored, on="appid", how="left", suffixes=("", "_stored"), indicator=True)
+    changed = (merged["_merge"] == "left_only") | (merged["rtime_last_played"] != merged["rtime_last_played_stored"])
+    # 本次没有任何游戏时不做删除，避免一次异常响应清空整张表
+    removed = stored.loc[~stored["appid"].isin(df["appid"]), "appid"].tolist() if len(df) else []
+    return df[changed.to_numpy()], removed
+
+
+def SteamDA_EnsureOwnedGameTable(con):
+    metadata.create_all(con, tables=[dim_steam_owned_game])
+    # 旧版 to_sql(if_exists='replace') 建的表没有主键，补上后才能按 appid upsert
+    if not inspect(con).get_pk_constraint("dim_steam_owned_game")["constrained_columns"]:
+        con.execute(text("ALTER TABLE dim_steam_owned_game MODIFY appid VARCHAR(100) NOT NULL, ADD PRIMARY KEY (appid)"))
+
+
+def SteamDA_UpsertOwnedGames(df):
+    with get_engine().begin() as con:
+        SteamDA_EnsureOwnedGameTable(con)
+        stored = pd.read_sql(text("SELECT appid, rtime_last_played FROM dim_steam_owned_game"), con)
+        stored["appid"] = stored["appid"].astype(str)
+        changed, removed = SteamDA_ChangedGames(df, stored)
+
+        if len(changed):
+            # 一条多行 INSERT ... ON DUPLICATE KEY UPDATE 写入全部变化的游戏
+            records = changed.astype(object).where(changed.notna(), None).to_dict("records")
+            stmt = mysql_insert(dim_steam_owned_game).values(records)
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in OWNED_GAME_COLUMNS[1:]})
+            con.execute(stmt)
+        if removed:
+            # 已不在库中的游戏（如退款）与整表重写时一样删除
+            con.execute(dim_steam_owned_game.delete().where(dim_steam_owned_game.c.appid.in_(removed)))
+
+    print("owned games: total=%d changed=%d removed=%d" % (len(df), len(changed), len(removed)))
+
+
 def SteamDA_OwnedGames(tocken, steamid):
     results = Steam_GetOwnedGames(tocken, steamid)
 
     # print(results["response"]["games"][0])
 
-    appid = []
-    game_name = []
-    img_icon_url = []
-    playtime_forever = []
-    playtime_windows_forever = []
-    playtime_mac_forever = []
-    playtime_linux_forever = []
-    rtime_last_played = []
-
-    for i in results["response"]["games"]:
-        appid.append(i["appid"])
-        game_name.append(i["name"])
-        img_icon_url.append(i["img_icon_url"])
-        playtime_forever.append(i["playtime_forever"])
-        playtime_windows_forever.append(i["playtime_windows_forever"])
-        playtime_mac_forever.append(i["playtime_mac_forever"])
-        playtime_linux_forever.append(i["playtime_linux_forever"])
-        rtime_last_played.append(i["rtime_last_played"])
-
-    df = pd.DataFrame({"appid": appid, "game_name": game_name, "img_icon_url": img_icon_url, "playtime_forever": playtime_forever, "playtime_windows_forever": playtime_windows_forever,
-                       "playtime_mac_forever": playtime_mac_forever, "playtime_linux_forever": playtime_linux_forever, "rtime_last_played": rtime_last_played})
+    df = SteamDA_OwnedGamesFrame(results)
 
     # print(df)
 
-    con_engine = create_engine(database_url + '?charset=utf8')
+    if ingest_mode == "incremental":
+        SteamDA_UpsertOwnedGames(df)
+        return
 
     dtype = {
         "appid": types.String(length=100),
@@ -87,7 +147,7 @@ def SteamDA_OwnedGames(tocken, steamid):
         "rtime_last_played": types.Integer()
     }
 
-    df.to_sql('dim_steam_owned_game', con_engine, dtype=dtype, if_exists='replace', index=False)
+    df.to_sql('dim_steam_owned_game', get_engine(), dtype=dtype, if_exists='replace', index=False)
 
 
 def SteamDA_GamePlayedRecord():
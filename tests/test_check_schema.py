@@ -0,0 +1,103 @@
+"""--check-schema：热点查询的 EXPLAIN 检查"""
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+import github_trending as gt
+
+
+class FakeCursor:
+    column_names = ('id', 'select_type', 'table', 'type', 'key')
+
+    def __init__(self, key):
+        self.key = key
+
+    def fetchall(self):
+        return [(1, 'SIMPLE', 't', 'ref' if self.key else 'ALL', self.key)]
+
+
+@pytest.mark.parametrize('name, query, params', gt.HOT_QUERIES)
+def test_hot_queries_are_explains_with_matching_params(name, query, params):
+    assert query.strip().startswith('EXPLAIN ')
+    assert query.count('%s') == len(params or ())
+
+
+def test_check_hot_queries_reports_full_scans(monkeypatch):
+    full_scans = {'summary_backlog', 'refresh_lease_claim'}
+    executed = []
+
+    def execute_query(query, params=None):
+        name = next(name for name, hot_query, _ in gt.HOT_QUERIES if hot_query == query)
+        executed.append(name)
+        return FakeCursor(None if name in full_scans else 'idx')
+
+    monkeypatch.setattr(gt, 'execute_query', execute_query)
+    assert set(gt.check_hot_queries()) == full_scans
+    assert executed == [name for name, _, _ in gt.HOT_QUERIES]
+
+
+def test_check_schema_exits_on_unindexed_queries(monkeypatch):
+    monkeypatch.setattr(gt, 'check_hot_queries', lambda: ['summary_backlog'])
+    monkeypatch.setattr(sys, 'argv', ['github_trending.py', '--check-schema'])
+    with pytest.raises(SystemExit, match='summary_backlog'):
+        gt.main()
+
+
+# 真实数据库上的检查：设置 TEST_DATABASE_URL（一个可丢弃的 MySQL 库）时执行，CI 中由 MySQL 服务容器提供
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+
+def insert_rows(uow, table, columns, rows):
+    for offset in range(0, len(rows), 500):
+        chunk = rows[offset:offset + 500]
+        placeholders = ','.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * len(chunk))
+        uow.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders}",
+                    [value for row in chunk for value in row])
+
+
+def seed(uow):
+    """按线上的数据分布造数：大部分仓库已有摘要、大部分租约已完成，热点查询的条件有选择性"""
+    start = date(2023, 1, 1)
+    languages = ['any', 'python', 'go', 'rust', 'javascript', 'typescript']
+    trending = []
+    for day in range(0, 365, 3):
+        for language in languages:
+            for rank in range(1, 11):
+                name = f'owner{(day * 7 + rank) % 400}/repo{rank}'
+                trending.append((language, start + timedelta(days=day), name, rank, 1000 + rank, rank * 10))
+    trending += [('any', date(2024, 1, 1), 'torvalds/linux', rank, 1000, 10) for rank in range(1, 4)]
+    insert_rows(uow, 'github_trending',
+                ('language', 'date', 'repository_name', 'sort_index', 'repo_star', 'repo_star_today'), trending)
+    repos = []
+    for idx in range(3000):
+        repos.append((f'owner{idx}/repo{idx}', None if idx % 20 == 0 else 'summary',
+                      -1 if idx % 97 == 0 else 1700000000 + idx, start + timedelta(days=idx % 365)))
+    insert_rows(uow, 'github_repository', ('name', 'ai_summary', 'last_flush_time', 'last_in_trending'), repos)
+    leases = [(f'owner{idx}/repo{idx}', idx % 1000, -1 if idx % 10 == 0 else 0, None if idx % 10 == 0 else 1)
+              for idx in range(3000)]
+    insert_rows(uow, 'github_refresh_lease', ('name', 'priority', 'lease_until', 'done_at'), leases)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL 未设置')
+    monkeypatch.setattr(gt, 'DATABASE_URL', TEST_DATABASE_URL)
+    monkeypatch.setattr(gt, 'app', gt.TrackerApp())
+    # 先以迁移期间的方式直连，清空上一次测试留下的表，再从头执行迁移
+    gt.app._migrating = True
+    cursor = gt.execute_query("SHOW TABLES")
+    for (table,) in cursor.fetchall():
+        gt.execute_query(f"DROP TABLE `{table}`")
+    gt.app._migrating = False
+    yield
+    gt.app.close()
+
+
+def test_hot_queries_use_indexes_on_real_schema(database):
+    gt.run_in_transaction(seed)
+    for table in ('github_trending', 'github_repository', 'github_refresh_lease'):
+        gt.execute_query(f"ANALYZE TABLE {table}").fetchall()
+    assert gt.check_hot_queries() == []
@@ -0,0 +1,162 @@
+"""github_send 的响应分类与重试：用脚本化的 requests 传输适配器代替 GitHub API"""
+import io
+import time
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+import github_trending as gt
+
+API = 'https://api.example.test'
+
+
+class ScriptedAdapter(BaseAdapter):
+    """按路径依次返回预设的响应；'net' 表示抛出网络错误"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        path = request.url[len(API):]
+        self.requests.append((path, request.headers.get('Authorization')))
+        step = self.script[path].pop(0)
+        if step == 'net':
+            raise requests.ConnectionError('connection reset')
+        status, headers, body = step
+        response = Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.raw = io.BytesIO(body.encode())
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_response(status, headers=None, body=''):
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = body.encode()
+    return response
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """独立的运行上下文：两个 token、脚本化传输，sleep 只记录不等待"""
+    app = gt.TrackerApp()
+    app._github_tokens = gt.GitHubTokenPool(['first', 'second'])
+    monkeypatch.setattr(gt, 'app', app)
+    monkeypatch.setattr(gt, 'GITHUB_API_URL', API)
+    sleeps = []
+    monkeypatch.setattr(gt.time, 'sleep', lambda seconds: sleeps.append(seconds))
+    script = {}
+    adapter = ScriptedAdapter(script)
+    app.github_session.mount(API, adapter)
+    yield script, adapter, sleeps
+    app.close()
+
+
+def get(path):
+    with gt.github_api_get(f'{API}{path}', conditional=False) as response:
+        return gt.parse_github_response(response)
+
+
+def test_is_rate_limited():
+    assert gt.is_rate_limited(make_response(429))
+    assert gt.is_rate_limited(make_response(403, {'Retry-After': '10'}))
+    assert gt.is_rate_limited(make_response(403, {'X-RateLimit-Remaining': '0'}))
+    assert gt.is_rate_limited(make_response(403, body='{"message": "You have exceeded a secondary rate limit"}'))
+    assert not gt.is_rate_limited(make_response(403, {'X-RateLimit-Remaining': '10'},
+                                                '{"message": "Resource not accessible by integration"}'))
+    assert not gt.is_rate_limited(make_response(404))
+
+
+def test_github_retry_delay():
+    assert gt.github_retry_delay(0, make_response(403, {'Retry-After': '7'}), True) == pytest.approx(7.5, abs=0.5)
+    reset = int(time.time()) + 30
+    primary = make_response(403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)})
+    assert 29 <= gt.github_retry_delay(0, primary, True) <= 32
+    # 次级限额未给出等待时间时至少等一分钟
+    assert gt.github_retry_delay(0, make_response(403), True) >= 60
+    assert gt.github_retry_delay(2, make_response(502), False) == pytest.approx(4.5, abs=0.5)
+
+
+@pytest.mark.parametrize('status', gt.GONE_STATUSES)
+def test_gone_statuses_are_not_found(github, status):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(status, {}, '{"message": "Not Found"}')]
+    assert get('/repos/a/b') is gt.NOT_FOUND
+    assert len(adapter.requests) == 1
+
+
+def test_5xx_and_network_errors_are_retried(github):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(502, {}, 'bad gateway'), 'net', (200, {}, '{"stargazers_count": 1}')]
+    assert get('/repos/a/b') == {'stargazers_count': 1}
+    assert len(adapter.requests) == 3
+    assert len([seconds for seconds in sleeps if seconds > 0]) == 2
+
+
+def test_permission_403_raises_without_retry(github):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(403, {'X-RateLimit-Remaining': '10'}, '{"message": "Resource not accessible"}')]
+    with pytest.raises(gt.GitHubError) as excinfo:
+        get('/repos/a/b')
+    assert not isinstance(excinfo.value, gt.GitHubRateLimited)
+    assert len(adapter.requests) == 1
+
+
+def test_secondary_rate_limit_switches_token(github):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(403, {'Retry-After': '30'}, '{"message": "You have exceeded a secondary rate limit"}'),
+                            (200, {}, '{}')]
+    assert get('/repos/a/b') == {}
+    tokens = [authorization for _, authorization in adapter.requests]
+    assert tokens == ['token first', 'token second']
+    # 换用的 token 立即可用，不必等待 Retry-After
+    assert all(seconds < 1 for seconds in sleeps)
+
+
+def test_exhausted_quota_raises_rate_limited(github, monkeypatch):
+    script, adapter, sleeps = github
+    gt.app._github_tokens = gt.GitHubTokenPool(['only'])
+    reset = str(int(time.time()) + 3600)
+    script['/repos/a/b'] = [(403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset},
+                             '{"message": "API rate limit exceeded"}')]
+    monkeypatch.setattr(gt, 'GITHUB_MAX_RETRY_WAIT', 900)
+    with pytest.raises(gt.GitHubRateLimited):
+        get('/repos/a/b')
+    assert len(adapter.requests) == 1
+
+
+def test_bad_credentials_eject_token(github):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(401, {}, '{"message": "Bad credentials"}'), (200, {}, '{}')]
+    assert get('/repos/a/b') == {}
+    pool = gt.app.github_tokens
+    assert pool.tokens[0].ejected == 'Bad credentials'
+    assert [token.name for token in pool.active()] == ['token2']
+    assert adapter.requests[1][1] == 'token second'
+
+
+def test_ejection_does_not_use_up_retries(github, monkeypatch):
+    script, adapter, sleeps = github
+    monkeypatch.setattr(gt, 'GITHUB_MAX_RETRIES', 1)
+    script['/repos/a/b'] = [(502, {}, 'bad gateway'), (401, {}, '{"message": "Bad credentials"}'), (200, {}, '{}')]
+    assert get('/repos/a/b') == {}
+    assert [authorization for _, authorization in adapter.requests] == ['token first', 'token first', 'token second']
+
+
+def test_all_tokens_ejected_raises(github):
+    script, adapter, sleeps = github
+    script['/repos/a/b'] = [(401, {}, '{"message": "Bad credentials"}')] * 2
+    with pytest.raises(gt.GitHubError):
+        get('/repos/a/b')
+    assert gt.app.github_tokens.active() == []
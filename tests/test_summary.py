@@ -0,0 +1,155 @@
+"""摘要请求的重试与预算：用本地的假 OpenAI 兼容服务器代替大模型接口"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import github_trending as gt
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """按顺序执行预设的步骤：(状态码, 响应头) 返回错误，'slow' 超过超时时间才响应，'ok' 返回摘要"""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests.append(body)
+            step = server.script.pop(0) if server.script else 'ok'
+        if step == 'slow':
+            # 测试替换了 time.sleep，这里用 Event 等待
+            threading.Event().wait(0.5)
+            step = 'ok'
+        if step == 'ok':
+            status, headers = 200, {}
+            payload = {'choices': [{'message': {'content': f' summary {len(server.requests)} '}}],
+                       'usage': {'total_tokens': server.tokens}}
+        else:
+            status, headers = step
+            payload = {'error': {'message': 'try again'}}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def openai(monkeypatch):
+    """独立的运行上下文：本地假服务器、独立的摘要预算，sleep 只记录不等待"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAI)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.script = []
+    server.tokens = 10
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    app = gt.TrackerApp()
+    monkeypatch.setattr(gt, 'app', app)
+    monkeypatch.setattr(gt, 'OPENAI_API_URL', f'http://127.0.0.1:{server.server_address[1]}')
+    monkeypatch.setattr(gt, 'OPENAI_API_KEY', 'test')
+    monkeypatch.setattr(gt, 'SUMMARY_TIMEOUT', 0.2)
+    monkeypatch.setattr(gt, 'summary_budget', gt.SummaryBudget(0, 0, 0))
+    sleeps = []
+    monkeypatch.setattr(gt.time, 'sleep', lambda seconds: sleeps.append(seconds))
+    yield server, sleeps
+    app.close()
+    server.shutdown()
+    server.server_close()
+
+
+def summarise():
+    return gt.request_ai_summary('a/b', 'about', 'readme')
+
+
+def test_success_counts_tokens(openai):
+    server, sleeps = openai
+    assert summarise() == 'summary 1'
+    assert gt.summary_budget.tokens == 10
+    assert gt.summary_budget.requests == 1
+    assert server.requests[0]['messages'][1]['content'].endswith('<README>\nreadme\n</README>')
+    assert sleeps == []
+
+
+def test_429_and_5xx_are_retried_with_backoff(openai):
+    server, sleeps = openai
+    server.script = [(429, {}), (502, {}), (503, {})]
+    assert summarise() == 'summary 4'
+    assert sleeps == [1, 2, 4]
+
+
+def test_retry_after_is_honoured(openai):
+    server, sleeps = openai
+    server.script = [(429, {'Retry-After': '7'})]
+    assert summarise() == 'summary 2'
+    assert sleeps == [7]
+
+
+def test_timeout_is_retried(openai):
+    server, sleeps = openai
+    server.script = ['slow']
+    assert summarise() == 'summary 2'
+    assert sleeps == [1]
+
+
+def test_network_error_is_retried(openai, monkeypatch):
+    server, sleeps = openai
+    post = gt.app.openai_session.post
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise requests.ConnectionError('connection reset')
+        return post(*args, **kwargs)
+
+    monkeypatch.setattr(gt.app.openai_session, 'post', flaky)
+    assert summarise() == 'summary 1'
+    assert sleeps == [1]
+
+
+def test_raises_after_max_retries(openai, monkeypatch):
+    server, sleeps = openai
+    monkeypatch.setattr(gt, 'SUMMARY_MAX_RETRIES', 2)
+    server.script = [(500, {})] * 3
+    with pytest.raises(requests.HTTPError):
+        summarise()
+    assert len(server.requests) == 3
+    assert sleeps == [1, 2]
+
+
+def test_timeout_raises_after_max_retries(openai, monkeypatch):
+    server, sleeps = openai
+    monkeypatch.setattr(gt, 'SUMMARY_MAX_RETRIES', 1)
+    server.script = ['slow', 'slow']
+    with pytest.raises(requests.Timeout):
+        summarise()
+    assert sleeps == [1]
+
+
+def test_budget_stops_async_generate_summaries(openai, monkeypatch):
+    server, sleeps = openai
+    server.tokens = 60
+    monkeypatch.setattr(gt, 'summary_budget', gt.SummaryBudget(100, 0, 0))
+    monkeypatch.setattr(gt, 'SUMMARY_CONCURRENCY', 1)
+    monkeypatch.setattr(gt, 'load_readme', lambda repo_name: 'readme')
+    monkeypatch.setattr(gt, 'get_ai_summary', lambda repo_name, about, readme: gt.request_ai_summary(
+        repo_name, about, readme))
+    written = []
+    monkeypatch.setattr(gt, 'run_in_transaction', lambda work, repo_name, summary: written.append(repo_name))
+    repos = [(f'o/r{idx}', 'about') for idx in range(5)]
+    results = asyncio.run(gt.async_generate_summaries(repos))
+    # 两次请求用掉 120 个 token 后超出预算，其余仓库不再请求
+    assert results == [True, True, False, False, False]
+    assert written == ['o/r0', 'o/r1']
+    assert len(server.requests) == 2
+    assert gt.summary_budget.exhausted()
@@ -0,0 +1,45 @@
+"""趋势分析通过调用方传入的 db 访问数据库，不自行导入 github_trending"""
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('numpy')
+import trending_analytics as ta  # noqa: E402
+
+
+class FakeDb(types.SimpleNamespace):
+    def __init__(self, rows):
+        super().__init__(state={}, queries=[], transactions=[])
+        self.rows = rows
+
+    def execute_query(self, query, params=None):
+        self.queries.append((query, params))
+        return types.SimpleNamespace(fetchall=lambda: self.rows)
+
+    def get_state(self, name, default=None):
+        return self.state.get(name, default)
+
+    def set_state(self, name, value):
+        self.state[name] = value
+
+    def run_in_transaction(self, work, *args):
+        self.transactions.append((work.__name__, args))
+
+
+def test_module_does_not_import_tracker():
+    # 在独立进程里检查，避免影响其他测试已导入的 github_trending
+    code = "import sys, trending_analytics; sys.exit('github_trending' in sys.modules)"
+    root = os.path.dirname(os.path.abspath(ta.__file__))
+    assert subprocess.run([sys.executable, '-c', code], cwd=root).returncode == 0
+
+
+def test_update_trends_uses_passed_db():
+    db = FakeDb([])
+    ta.update_trends(db)
+    assert len(db.queries) == 1
+    assert db.transactions == []
+    assert 'analytics_watermark' in db.state
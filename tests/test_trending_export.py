@@ -0,0 +1,59 @@
+"""仓库信息的增量导出：只导出水位之后有变化的仓库"""
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
+pytest.importorskip('pyarrow')
+import trending_export as te  # noqa: E402
+
+
+class SqliteDb:
+    """用 sqlite 代替 MySQL 执行导出查询（%s 占位符换成 ?）"""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:')
+        columns = ', '.join(name for name, _ in te.REPOSITORY_COLUMNS)
+        self.conn.execute(f'CREATE TABLE github_repository ({columns})')
+
+    def insert(self, **values):
+        row = [values.get(name) for name, _ in te.REPOSITORY_COLUMNS]
+        self.conn.execute(f"INSERT INTO github_repository VALUES ({', '.join('?' * len(row))})", row)
+
+    def get_db_connection(self):
+        return self
+
+    def close_db_connection(self, conn):
+        pass
+
+    def cursor(self, buffered=True):
+        db = self
+
+        class Cursor:
+            def execute(self, query, params):
+                params = [str(value) if isinstance(value, date) else value for value in params]
+                self.rows = db.conn.execute(query.replace('%s', '?'), params)
+
+            def fetchmany(self, size):
+                return [tuple(date.fromisoformat(value) if name in ('first_in_trending', 'last_in_trending')
+                              and value else value for (name, _), value in zip(te.REPOSITORY_COLUMNS, row))
+                        for row in self.rows.fetchmany(size)]
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+
+def test_export_repositories_is_incremental(tmp_path):
+    db = SqliteDb()
+    since_ts = int(datetime(2026, 5, 1, tzinfo=timezone.utc).timestamp())
+    db.insert(name='old/never-flushed', last_in_trending=date(2026, 4, 1))
+    db.insert(name='new/never-flushed', last_in_trending=date(2026, 5, 2))
+    db.insert(name='old/flushed', last_flush_time=since_ts - 10, last_in_trending=date(2026, 4, 1))
+    db.insert(name='new/flushed', last_flush_time=since_ts + 10, last_in_trending=date(2026, 4, 1))
+    db.insert(name='new/deleted', last_flush_time=since_ts - 10, delete_time=since_ts + 10)
+    writer = te.export_repositories(db, str(tmp_path), since_ts, since_ts + 100)
+    assert writer.rows == 3
+    names = te.read_repositories(str(tmp_path), ['name']).column('name').to_pylist()
+    assert names == ['new/deleted', 'new/flushed', 'new/never-flushed']
@@ -0,0 +1,27 @@
+"""趋势页解析：各后端在 fixtures/trending 样本上的结果一致"""
+import glob
+import os
+
+import pytest
+
+import trending_parser as tp
+
+PAGES = sorted(glob.glob(os.path.join(tp.TRENDING_FIXTURES, '*.html')))
+
+
+@pytest.mark.parametrize('path', PAGES, ids=os.path.basename)
+def test_backends_agree_on_fixture(path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    results = {backend: tp.PARSERS[backend](html) for backend in tp.available_parsers()}
+    expected = results.pop('bs4')
+    assert len(expected) == 25
+    assert all(repo['repository_name'].count('/') == 1 and repo['star_num'] > 0 for repo in expected)
+    for backend, repos in results.items():
+        assert repos == expected, backend
+
+
+def test_parse_stars():
+    assert tp.parse_stars('\n  12,345\n') == 12345
+    assert tp.parse_stars('1,024 stars today') == 1024
+    assert tp.parse_stars('') == 0
@@ -0,0 +1,63 @@
+"""趋势统计的跨页去重：只有提交成功的写入才计入本次运行已写入的仓库"""
+import mysql.connector
+import pytest
+
+import github_trending as gt
+
+
+class FakeUnitOfWork:
+    def __init__(self, fail):
+        self.fail = fail
+        self.statements = []
+        self.commit_hooks = []
+
+    def execute(self, query, params=None):
+        if self.fail:
+            raise mysql.connector.DatabaseError('lock wait timeout')
+        self.statements.append(params)
+
+    def after_commit(self, hook, *args, **kwargs):
+        self.commit_hooks.append((hook, args, kwargs))
+
+
+@pytest.fixture
+def transactions(monkeypatch):
+    """按 outcomes 依次模拟提交成功（False）或失败（True）的事务"""
+    outcomes = []
+    units = []
+
+    def run_in_transaction(work, *args):
+        uow = FakeUnitOfWork(outcomes.pop(0))
+        units.append(uow)
+        result = work(uow, *args)
+        for hook, hook_args, kwargs in uow.commit_hooks:
+            hook(*hook_args, **kwargs)
+        return result
+
+    monkeypatch.setattr(gt, 'run_in_transaction', run_in_transaction)
+    monkeypatch.setattr(gt, 'trending_stats_written', {})
+    return outcomes, units
+
+
+def page(*names):
+    return [{'repository_name': name, 'language': 'Python', 'star_num': 10, 'fork_num': 1, 'sort_index': rank}
+            for rank, name in enumerate(names, 1)]
+
+
+def test_repeated_repos_are_written_once(transactions):
+    outcomes, units = transactions
+    outcomes.extend([False, False])
+    gt.update_trending_stats(page('a/a', 'b/b'))
+    gt.update_trending_stats(page('c/c', 'a/a', 'b/b'))
+    # 第二页中 a/a、b/b 的排名更差，不再写入
+    assert len(units[1].statements[0]) == 8
+
+
+def test_failed_write_is_retried_by_later_pages(transactions):
+    outcomes, units = transactions
+    outcomes.extend([True, False])
+    with pytest.raises(mysql.connector.DatabaseError):
+        gt.update_trending_stats(page('a/a', 'b/b'))
+    assert gt.trending_stats_written == {}
+    gt.update_trending_stats(page('c/c', 'a/a', 'b/b'))
+    assert len(units[1].statements[0]) == 24
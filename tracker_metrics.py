@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# 直方图桶上限（秒），覆盖从数据库语句到大模型请求的耗时范围
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+PROMETHEUS_PREFIX = 'github_tracker_'
+
+# 未启用时所有计时共用同一个空上下文，不产生额外分配
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """累计型直方图：次数、总和、最值与各桶计数"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[idx] += 1
+                break
+
+    def quantile(self, q):
+        """按桶估算分位数（取所在桶的上限）"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Timer:
+    """计时上下文，退出时把耗时记入直方图"""
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start_time, **self.labels)
+        return False
+
+
+class Metrics:
+    """运行指标：计数器、瞬时值与耗时直方图，按 (名称, 标签) 聚合；未启用时各方法直接返回"""
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.started_at = None
+        self.lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+        self.started_at = time.time()
+
+    def inc(self, name, value=1, **labels):
+        """计数器加 value"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """瞬时值（如剩余额度），保留最后一次设置的值"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """记录一次耗时（秒）"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def timer(self, name, **labels):
+        """with metrics.timer('db_statement_seconds', op='SELECT'): ..."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return Timer(self, name, labels)
+
+    def report(self):
+        """JSON 运行报告"""
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items(), key=_sort_key)]
+            gauges = [{'name': name, 'labels': dict(labels), 'value': value}
+                      for (name, labels), value in sorted(self.gauges.items(), key=_sort_key)]
+            histograms = [{
+                'name': name,
+                'labels': dict(labels),
+                'count': histogram.count,
+                'sum': round(histogram.sum, 6),
+                'min': histogram.min,
+                'max': histogram.max,
+                'p50': histogram.quantile(0.5),
+                'p95': histogram.quantile(0.95),
+            } for (name, labels), histogram in sorted(self.histograms.items(), key=_sort_key)]
+        return {
+            'started_at': self.started_at,
+            'wall_seconds': round(time.time() - self.started_at, 3) if self.started_at else None,
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': histograms,
+        }
+
+    def prometheus(self):
+        """Prometheus 文本格式（可供 node_exporter textfile collector 读取）"""
+        lines = []
+        with self.lock:
+            for kind, values in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted({name for name, _ in values}):
+                    lines.append(f'# TYPE {PROMETHEUS_PREFIX}{name} {kind}')
+                    for (other, labels), value in sorted(values.items(), key=_sort_key):
+                        if other == name:
+                            lines.append(f'{PROMETHEUS_PREFIX}{name}{_labels(labels)} {value}')
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f'# TYPE {PROMETHEUS_PREFIX}{name} histogram')
+                for (other, labels), histogram in sorted(self.histograms.items(), key=_sort_key):
+                    if other != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f'{PROMETHEUS_PREFIX}{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+                    lines.append(f'{PROMETHEUS_PREFIX}{name}_bucket{_labels(labels, le="+Inf")} {histogram.count}')
+                    lines.append(f'{PROMETHEUS_PREFIX}{name}_sum{_labels(labels)} {histogram.sum}')
+                    lines.append(f'{PROMETHEUS_PREFIX}{name}_count{_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path):
+        # 先写临时文件再改名，避免采集到写了一半的文件
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(path + '.tmp', path)
+
+
+def _sort_key(item):
+    name, labels = item[0]
+    return name, [(key, str(value)) for key, value in labels]
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+metrics = Metrics()
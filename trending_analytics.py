@@ -0,0 +1,237 @@
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# 数据库辅助函数（execute_query / run_in_transaction / get_state / set_state）由调用方以 db 传入：
+# github_trending 以 __main__ 运行时再 import github_trending 会得到第二份模块（第二个连接池、再跑一遍迁移）
+TREND_WINDOW_DAYS = 7  # 增速窗口（天），与 github_trending.REFRESH_VELOCITY_DAYS 一致；加速度比较相邻两个窗口
+TREND_BATCH_ROWS = 1000  # 单条 upsert 语句写入的仓库数
+
+
+def load_daily(db, since, until):
+    """读取 (since, until] 之间的日汇总；since 为 None 时读取全部历史"""
+    query = """
+    SELECT date, language, repository_name, best_rank, stars_gained
+    FROM github_trending_daily
+    WHERE date <= %s
+    """
+    params = [until]
+    if since is not None:
+        query += " AND date > %s"
+        params.append(since)
+    cursor = db.execute_query(query, params)
+    frame = pd.DataFrame(cursor.fetchall(), columns=['date', 'language', 'repository_name', 'best_rank',
+                                                     'stars_gained'])
+    frame['date'] = pd.to_datetime(frame['date'])
+    frame['best_rank'] = frame['best_rank'].astype('float64')
+    frame['stars_gained'] = frame['stars_gained'].fillna(0).astype('float64')
+    return frame
+
+
+def per_repo_day(frame):
+    """同一仓库同一天在多个榜单（语言 / 口语）出现时合并：取最佳排名与最大当日 star"""
+    return frame.groupby(['repository_name', 'date'], as_index=False).agg(
+        best_rank=('best_rank', 'min'), stars_gained=('stars_gained', 'max'))
+
+
+def window_metrics(frame, as_of):
+    """截至 as_of 的窗口指标：
+    velocity       最近 TREND_WINDOW_DAYS 天平均每天新增 star（未上榜的天按 0 计）
+    acceleration   与前一个窗口相比，平均每天新增 star 的变化量（每天）
+    rank_slope     最近两个窗口内排名对日期的线性回归斜率，负数表示排名上升
+    breakout_score 增速在所在语言榜单中的稳健 z 分数（取各语言中最高），正加速度时放大"""
+    days = TREND_WINDOW_DAYS
+    daily = per_repo_day(frame)
+    age = (pd.Timestamp(as_of) - daily['date']).dt.days.to_numpy()
+    stars = daily['stars_gained'].to_numpy()
+    daily['recent'] = np.where(age < days, stars, 0)
+    daily['previous'] = np.where((age >= days) & (age < 2 * days), stars, 0)
+    # 排名斜率的闭式解：slope = (nΣxy - ΣxΣy) / (nΣx² - (Σx)²)，x 为距 as_of 的天数取负
+    x = -age.astype('float64')
+    y = daily['best_rank'].to_numpy()
+    daily['x'], daily['xx'], daily['xy'] = x, x * x, x * y
+    sums = daily.groupby('repository_name').agg(
+        recent=('recent', 'sum'), previous=('previous', 'sum'), n=('x', 'size'),
+        sx=('x', 'sum'), sy=('best_rank', 'sum'), sxx=('xx', 'sum'), sxy=('xy', 'sum'))
+    metrics = pd.DataFrame(index=sums.index)
+    metrics['velocity'] = sums['recent'] / days
+    metrics['acceleration'] = (sums['recent'] - sums['previous']) / days / days
+    denominator = sums['n'] * sums['sxx'] - sums['sx'] ** 2
+    slope = (sums['n'] * sums['sxy'] - sums['sx'] * sums['sy']) / denominator.where(denominator != 0)
+    metrics['rank_slope'] = slope
+
+    # 按语言榜单计算增速分布，用中位数与 MAD 做稳健 z 分数，跨语言可比
+    recent = frame[(pd.Timestamp(as_of) - frame['date']).dt.days < days]
+    by_language = recent.groupby(['language', 'repository_name'])['stars_gained'].sum().div(days).rename('velocity')
+    by_language = by_language.reset_index()
+    grouped = by_language.groupby('language')['velocity']
+    median = grouped.transform('median')
+    mad = (by_language['velocity'] - median).abs().groupby(by_language['language']).transform('median')
+    by_language['z'] = (by_language['velocity'] - median) / (1.4826 * mad + 1)
+    metrics['breakout_score'] = by_language.groupby('repository_name')['z'].max()
+    relative_acceleration = (metrics['acceleration'] * days / metrics['velocity'].clip(lower=1)).clip(0, 3)
+    metrics['breakout_score'] = metrics['breakout_score'].fillna(0) * (1 + relative_acceleration)
+    return metrics
+
+
+def lifetime_aggregates(frame):
+    """(since, as_of] 区间内的累计量：上榜天数、新增 star 合计、单日最高、最佳排名、首次与最近上榜"""
+    daily = per_repo_day(frame)
+    return daily.groupby('repository_name').agg(
+        days_on_list=('date', 'size'), total_stars_gained=('stars_gained', 'sum'),
+        peak_stars_day=('stars_gained', 'max'), best_rank=('best_rank', 'min'),
+        first_seen=('date', 'min'), last_seen=('date', 'max'))
+
+
+def write_trends(uow, rows, incremental):
+    """多行 upsert 趋势表；增量模式下累计量与已有值合并，全量模式下直接覆盖"""
+    query = """
+    INSERT INTO github_repository_trend
+    (name, trend_date, velocity, acceleration, rank_slope, breakout_score,
+     days_on_list, total_stars_gained, peak_stars_day, best_rank, first_seen, last_seen)
+    VALUES
+    """
+    query += ','.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(rows))
+    if incremental:
+        query += """
+        ON DUPLICATE KEY UPDATE
+        trend_date = VALUES(trend_date),
+        velocity = VALUES(velocity),
+        acceleration = VALUES(acceleration),
+        rank_slope = VALUES(rank_slope),
+        breakout_score = VALUES(breakout_score),
+        days_on_list = days_on_list + VALUES(days_on_list),
+        total_stars_gained = total_stars_gained + VALUES(total_stars_gained),
+        peak_stars_day = GREATEST(peak_stars_day, VALUES(peak_stars_day)),
+        best_rank = LEAST(COALESCE(best_rank, VALUES(best_rank)), COALESCE(VALUES(best_rank), best_rank)),
+        first_seen = COALESCE(first_seen, VALUES(first_seen)),
+        last_seen = COALESCE(VALUES(last_seen), last_seen)
+        """
+    else:
+        query += """
+        ON DUPLICATE KEY UPDATE
+        trend_date = VALUES(trend_date),
+        velocity = VALUES(velocity),
+        acceleration = VALUES(acceleration),
+        rank_slope = VALUES(rank_slope),
+        breakout_score = VALUES(breakout_score),
+        days_on_list = VALUES(days_on_list),
+        total_stars_gained = VALUES(total_stars_gained),
+        peak_stars_day = VALUES(peak_stars_day),
+        best_rank = VALUES(best_rank),
+        first_seen = VALUES(first_seen),
+        last_seen = VALUES(last_seen)
+        """
+    params = []
+    for row in rows:
+        params.extend(row)
+    uow.execute(query, params)
+
+
+def feed_repository_stats(uow, as_of):
+    """把最新的增速与突破分数写回 github_repository；已离开计算窗口的仓库清零"""
+    uow.execute("""
+    UPDATE github_repository_trend
+    SET trend_date = %s, velocity = 0, acceleration = 0, rank_slope = NULL, breakout_score = 0
+    WHERE trend_date < %s
+    """, (as_of, as_of))
+    uow.execute("""
+    UPDATE github_repository r
+    JOIN github_repository_trend t ON t.name = r.name
+    SET r.star_velocity = t.velocity,
+        r.breakout_score = t.breakout_score
+    """)
+
+
+def _value(value):
+    """numpy / pandas 标量转换为数据库驱动可接受的值"""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def build_rows(metrics, aggregates, as_of):
+    """合并窗口指标与累计量，生成写库的行；只在窗口内出现的仓库累计量为 0"""
+    table = metrics.join(aggregates, how='outer')
+    table[['days_on_list', 'total_stars_gained', 'peak_stars_day']] = \
+        table[['days_on_list', 'total_stars_gained', 'peak_stars_day']].fillna(0)
+    table[['velocity', 'acceleration', 'breakout_score']] = \
+        table[['velocity', 'acceleration', 'breakout_score']].fillna(0)
+    rows = []
+    for name, row in zip(table.index, table.itertuples(index=False)):
+        rows.append((
+            name,
+            as_of,
+            round(float(row.velocity), 3),
+            round(float(row.acceleration), 3),
+            _value(round(row.rank_slope, 4) if pd.notna(row.rank_slope) else None),
+            round(float(row.breakout_score), 3),
+            int(row.days_on_list),
+            int(row.total_stars_gained),
+            int(row.peak_stars_day),
+            _value(int(row.best_rank) if pd.notna(row.best_rank) else None),
+            _value(row.first_seen),
+            _value(row.last_seen),
+        ))
+    return rows
+
+
+def update_trends(db, full=False):
+    """计算仓库趋势指标：增量模式只读取水位之后的新数据与计算窗口所需的最近两个窗口；
+    只处理已完整的日期（不含今天，当天的日汇总仍会被后续运行重算）"""
+    start_time = time.time()
+    as_of = datetime.now(timezone.utc).date() - timedelta(days=1)
+    watermark = None if full else db.get_state('analytics_watermark')
+    since = datetime.strptime(watermark, '%Y-%m-%d').date() if watermark else None
+    if since is not None and since >= as_of:
+        return
+
+    window_start = as_of - timedelta(days=2 * TREND_WINDOW_DAYS)
+    load_since = window_start if since is None else min(since, window_start)
+    frame = load_daily(db, None if full or since is None else load_since, as_of)
+    if frame.empty:
+        db.set_state('analytics_watermark', as_of.isoformat())
+        return
+    metrics = window_metrics(frame[frame['date'] > pd.Timestamp(window_start)], as_of)
+    new_rows = frame if since is None else frame[frame['date'] > pd.Timestamp(since)]
+    aggregates = lifetime_aggregates(new_rows)
+    rows = build_rows(metrics, aggregates, as_of)
+
+    incremental = since is not None
+    for offset in range(0, len(rows), TREND_BATCH_ROWS):
+        db.run_in_transaction(write_trends, rows[offset:offset + TREND_BATCH_ROWS], incremental)
+    db.run_in_transaction(feed_repository_stats, as_of)
+    db.set_state('analytics_watermark', as_of.isoformat())
+    print(f"Trends: as_of={as_of} rows={len(frame)} repos={len(rows)} "
+          f"mode={'incremental' if incremental else 'full'} in {time.time() - start_time:.1f}s")
+
+
+def top_breakouts(db, limit=20):
+    """最新一天突破分数最高的仓库"""
+    cursor = db.execute_query("""
+    SELECT name, velocity, acceleration, rank_slope, breakout_score
+    FROM github_repository_trend
+    WHERE trend_date = (SELECT MAX(trend_date) FROM github_repository_trend)
+    ORDER BY breakout_score DESC
+    LIMIT %s
+    """, (limit,))
+    return cursor.fetchall()
+
+
+if __name__ == '__main__':
+    # 用法：python trending_analytics.py [--full]
+    import github_trending
+    try:
+        update_trends(github_trending, full='--full' in sys.argv[1:])
+        for name, velocity, acceleration, rank_slope, score in top_breakouts(github_trending):
+            print(f'{name:<50} velocity={velocity:8.1f} accel={acceleration:6.2f} '
+                  f'rank_slope={rank_slope if rank_slope is not None else "-":>6} breakout={score:.2f}')
+    finally:
+        github_trending.app.close()
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# 数据库辅助函数（get_db_connection / close_db_connection / get_state / set_state）由调用方以 db 传入，
+# 避免 github_trending 以 __main__ 运行时再导入出第二份模块
+EXPORT_BATCH_ROWS = int(os.environ.get('EXPORT_BATCH_ROWS', '10000'))  # 每次从服务端游标取出的行数
+
+# 导出的列；github_repository 不导出 README 全文
+TRENDING_COLUMNS = [
+    ('spoken_language', 'string'),
+    ('language', 'string'),
+    ('date_range', 'string'),
+    ('date', 'date32'),
+    ('repository_name', 'string'),
+    ('sort_index', 'int32'),
+    ('repo_star', 'int32'),
+    ('repo_star_today', 'int32'),
+]
+REPOSITORY_COLUMNS = [
+    ('name', 'string'),
+    ('language', 'string'),
+    ('fork_num', 'int32'),
+    ('star_num', 'int32'),
+    ('license', 'string'),
+    ('last_updated', 'int64'),
+    ('created_at', 'int64'),
+    ('about', 'string'),
+    ('about_link', 'string'),
+    ('ai_summary', 'string'),
+    ('last_flush_time', 'int64'),
+    ('delete_time', 'int64'),
+    ('first_in_trending', 'date32'),
+    ('top_in_trending', 'int32'),
+    ('last_in_trending', 'date32'),
+    ('in_trending_time', 'int32'),
+]
+
+
+def arrow_schema(columns):
+    import pyarrow as pa
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in columns])
+
+
+def stream_rows(db, query, params):
+    """使用非缓冲（服务端）游标分批读取，内存占用与表大小无关"""
+    conn = db.get_db_connection()
+    if conn is None:
+        raise RuntimeError("Failed to get database connection")
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+        db.close_db_connection(conn)
+
+
+class PartitionWriter:
+    """按 hive 风格目录（key=value）写 Parquet，每个分区一个文件"""
+
+    def __init__(self, root, key, columns):
+        self.root = root
+        self.key = key
+        # 分区列只体现在目录名中，不重复写入文件
+        self.indexes = [idx for idx, (name, _) in enumerate(columns) if name != key]
+        self.schema = arrow_schema([columns[idx] for idx in self.indexes])
+        self.value = None
+        self.writer = None
+        self.rows = 0
+        self.files = 0
+
+    def write(self, value, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if value != self.value:
+            self.close()
+            directory = os.path.join(self.root, f'{self.key}={value}')
+            os.makedirs(directory, exist_ok=True)
+            # 先写临时文件，完成后改名，避免读到写了一半的文件
+            self.path = os.path.join(directory, 'part-0.parquet')
+            self.writer = pq.ParquetWriter(self.path + '.tmp', self.schema, compression='zstd')
+            self.value = value
+            self.files += 1
+        arrays = [pa.array([row[idx] for row in rows], type=field.type)
+                  for idx, field in zip(self.indexes, self.schema)]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            os.replace(self.path + '.tmp', self.path)
+            self.writer = None
+
+
+def export_trending(db, root, since, until):
+    """导出 (since, until] 之间的趋势快照，按 date 分区"""
+    writer = PartitionWriter(os.path.join(root, 'github_trending'), 'date', TRENDING_COLUMNS)
+    query = f"""
+    SELECT {', '.join(name for name, _ in TRENDING_COLUMNS)}
+    FROM github_trending
+    WHERE date > %s
+      AND date <= %s
+    ORDER BY date
+    """
+    try:
+        for rows in stream_rows(db, query, (since, until)):
+            # 一批中可能跨越多个日期
+            start = 0
+            for idx in range(1, len(rows) + 1):
+                if idx == len(rows) or rows[idx][3] != rows[start][3]:
+                    writer.write(rows[start][3].isoformat(), rows[start:idx])
+                    start = idx
+    finally:
+        writer.close()
+    return writer
+
+
+def export_repositories(db, root, since_ts, export_ts):
+    """导出自上次导出以来有变化的仓库，按导出时间分区；读取时按 name 取最新一份"""
+    writer = PartitionWriter(os.path.join(root, 'github_repository'), 'export_ts', REPOSITORY_COLUMNS)
+    query = f"""
+    SELECT {', '.join(name for name, _ in REPOSITORY_COLUMNS)}
+    FROM github_repository
+    WHERE last_flush_time >= %s
+       OR delete_time >= %s
+       OR last_in_trending >= %s
+    """
+    since_date = datetime.fromtimestamp(since_ts, timezone.utc).date()
+    try:
+        for rows in stream_rows(db, query, (since_ts, since_ts, since_date)):
+            writer.write(export_ts, rows)
+    finally:
+        writer.close()
+    return writer
+
+
+def export_snapshots(db, root):
+    """增量导出：只追加上次水位之后的完整日期（不含今天，当天数据仍会被后续运行替换）"""
+    watermark = db.get_state('export_watermark', {})
+    today = datetime.now(timezone.utc).date()
+    until = today - timedelta(days=1)
+    since = datetime.strptime(watermark['date'], '%Y-%m-%d').date() if watermark.get('date') else datetime(1970, 1, 1).date()
+    started_at = int(time.time())
+
+    start_time = time.time()
+    trending = export_trending(db, root, since, until)
+    repositories = export_repositories(db, root, watermark.get('repository_ts', 0), started_at)
+    db.set_state('export_watermark', {'date': max(since, until).isoformat(), 'repository_ts': started_at})
+    print(f"Export: trending rows={trending.rows} dates={trending.files} "
+          f"repositories={repositories.rows} in {time.time() - start_time:.1f}s -> {root}")
+
+
+def read_trending(root, columns=None, filters=None):
+    """读取导出的趋势快照（内存映射），例如 filters=[('date', '>=', date(2024, 1, 1))]"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    partitioning = ds.partitioning(pa.schema([('date', pa.date32())]), flavor='hive')
+    return pq.read_table(os.path.join(root, 'github_trending'), columns=columns, filters=filters,
+                         memory_map=True, partitioning=partitioning)
+
+
+def read_repositories(root, columns=None):
+    """读取导出的仓库信息（内存映射），每个仓库只保留最新导出的一份"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    partitioning = ds.partitioning(pa.schema([('export_ts', pa.int64())]), flavor='hive')
+    table = pq.read_table(os.path.join(root, 'github_repository'), memory_map=True, partitioning=partitioning)
+    table = table.sort_by([('name', 'ascending'), ('export_ts', 'descending')])
+    # 排序后每个 name 的第一行即最新一份
+    names = table.column('name').to_pylist()
+    keep = [idx == 0 or names[idx] != names[idx - 1] for idx in range(len(names))]
+    table = table.filter(keep)
+    return table.select(columns) if columns else table
+
+
+if __name__ == '__main__':
+    # 用法：python trending_export.py EXPORT_DIR
+    if len(sys.argv) != 2:
+        print(f'usage: {sys.argv[0]} EXPORT_DIR')
+        sys.exit(1)
+    import github_trending
+    try:
+        export_snapshots(github_trending, sys.argv[1])
+    finally:
+        github_trending.app.close()
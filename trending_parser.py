@@ -0,0 +1,156 @@
+import glob
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+# 可选的高性能解析后端，未安装时回退到 BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+TRENDING_PARSER = os.environ.get('TRENDING_PARSER', 'auto')  # auto / selectolax / lxml / bs4
+# 基准测试默认使用的趋势页样本，目录结构与 benchmark_replay.py record 的输出一致
+TRENDING_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'trending')
+
+# XPath 中按 class 匹配的写法
+_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_LXML_ROWS = f"//article[{_CLASS.format('Box-row')}]"
+_LXML_MUTED = f".//a[{_CLASS.format('Link')} and {_CLASS.format('Link--muted')}]"
+_LXML_STARS_TODAY = f".//span[{_CLASS.format('float-sm-right')}]"
+
+
+def parse_stars(text):
+    """解析stars数量"""
+    numbers = re.findall(r'[\d,]+', text)
+    if numbers:
+        return int(numbers[0].replace(',', ''))
+    return 0
+
+
+def _repo(href, language, muted, stars_today):
+    """组装单个仓库的解析结果"""
+    return {
+        'repository_name': href.lstrip('/'),
+        'language': language.strip(),
+        'star_num': parse_stars(muted[0]),
+        'fork_num': parse_stars(muted[1]),
+        'stars_today': parse_stars(stars_today),
+    }
+
+
+def parse_with_bs4(html):
+    """BeautifulSoup 解析实现"""
+    # 仅作为回退实现，按需导入以减少启动开销
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    repos = []
+    for article in soup.select('article.Box-row'):
+        language = article.select_one('span[itemprop="programmingLanguage"]')
+        stars_today = article.select_one('span.float-sm-right')
+        muted = article.select('a.Link.Link--muted')
+        repos.append(_repo(
+            article.h2.a.get('href'),
+            language.text if language else '',
+            [link.text for link in muted],
+            stars_today.text if stars_today else '',
+        ))
+    return repos
+
+
+def parse_with_lxml(html):
+    """lxml 解析实现"""
+    doc = lxml.html.fromstring(html)
+    repos = []
+    for article in doc.xpath(_LXML_ROWS):
+        language = article.xpath('.//span[@itemprop="programmingLanguage"]')
+        stars_today = article.xpath(_LXML_STARS_TODAY)
+        repos.append(_repo(
+            article.xpath('.//h2//a/@href')[0],
+            language[0].text_content() if language else '',
+            [link.text_content() for link in article.xpath(_LXML_MUTED)],
+            stars_today[0].text_content() if stars_today else '',
+        ))
+    return repos
+
+
+def parse_with_selectolax(html):
+    """selectolax 解析实现"""
+    repos = []
+    for article in HTMLParser(html).css('article.Box-row'):
+        language = article.css_first('span[itemprop="programmingLanguage"]')
+        stars_today = article.css_first('span.float-sm-right')
+        repos.append(_repo(
+            article.css_first('h2 a').attributes.get('href'),
+            language.text() if language else '',
+            [link.text() for link in article.css('a.Link.Link--muted')],
+            stars_today.text() if stars_today else '',
+        ))
+    return repos
+
+
+PARSERS = {
+    'selectolax': parse_with_selectolax,
+    'lxml': parse_with_lxml,
+    'bs4': parse_with_bs4,
+}
+
+
+def available_parsers():
+    """返回当前环境可用的解析后端，按速度从快到慢排列"""
+    names = []
+    if HTMLParser is not None:
+        names.append('selectolax')
+    if lxml is not None:
+        names.append('lxml')
+    names.append('bs4')
+    return names
+
+
+def parse_trending_html(html, backend=None):
+    """解析趋势页面，返回按排名排列的仓库列表"""
+    backend = backend or TRENDING_PARSER
+    if backend == 'auto' or backend not in available_parsers():
+        backend = available_parsers()[0]
+    return PARSERS[backend](html)
+
+
+def benchmark(paths, rounds=5):
+    """对保存的趋势页面逐个后端测量解析速度与峰值内存"""
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    for backend in available_parsers():
+        parse = PARSERS[backend]
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            for html in pages:
+                parse(html)
+        elapsed = time.perf_counter() - start_time
+        # 内存单独测量一轮，避免 tracemalloc 影响计时；C 扩展内部的分配不计入
+        tracemalloc.start()
+        for html in pages:
+            parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{backend:<10} {len(pages) * rounds / elapsed:8.1f} pages/s  '
+              f'python heap peak {peak / 1024 / 1024:.2f} MiB')
+
+
+if __name__ == '__main__':
+    # 用法：python trending_parser.py [PAGE.html ...]，不指定页面时使用 fixtures/trending 下的样本
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(TRENDING_FIXTURES, '*.html')))
+    if not paths:
+        print(f'usage: {sys.argv[0]} [PAGE.html ...]')
+        sys.exit(1)
+    benchmark(paths)